@@ -13,7 +13,8 @@ class Sketch:
         super().__init__()
 
         self.face = face
-        self.sketch = body.parent.sketches.add(self.face.brepface)
+        self._brepface = self.face.brepface
+        self.sketch = body.parent.sketches.add(self._brepface)
         self.sketch.name = name
         self.lines = self.sketch.sketchCurves.sketchLines
 
@@ -23,7 +24,7 @@ class Sketch:
         # Project the hidden edges of the face into the sketch so that
         # the edges can easily be referenced from the Line class; making
         # other operations much easier.
-        for line in self.face.brepface.edges[0:4]:
+        for line in self._brepface.edges[0:4]:
             ref = self.sketch.project(line)
 
         # Select the new projected lines and create a Rectangle class
@@ -31,12 +32,14 @@ class Sketch:
         self.border = Rectangle(self.sketch, self.lines[4:8], construction=True)
 
         # Save some reference points that will be used later
+        self._is_vertical = self.border.is_vertical
+        self._width = self.border.width
         self.reference_points = self.border.reference_points
         self.reference_plane = self.sketch.referencePlane
         self.reference_line = self.border.reference_line
 
     def draw_rectangle(self, point, length, constrain=False):
-        width = self.border.width
+        width = self._width
 
         return Rectangle.draw(self.sketch,
                               point,
@@ -46,7 +49,7 @@ class Sketch:
                               self.border.bottom.left)
 
     def draw_margin(self, point):
-        end_point = self.offset_point(point, 0, self.border.width)
+        end_point = self.offset_point(point, 0, self._width)
 
         marginline = self.lines.addByTwoPoints(point, end_point)
         marginline.isConstruction = True
@@ -62,7 +65,7 @@ class Sketch:
         return marginline
 
     def offset_point(self, point, length, width=0):
-        if self.is_vertical:
+        if self._is_vertical:
             xoffset = width
             yoffset = length
         else:
@@ -75,15 +78,15 @@ class Sketch:
 
     @property
     def is_vertical(self):
-        return self.border.is_vertical
+        return self._is_vertical
 
     @property
     def name(self):
-        return self.face.brepface.name
+        return self._brepface.name
 
     @name.setter
     def name(self, value):
-        self.face.brepface.name = value
+        self._brepface.name = value
 
     @property
     def profiles(self):
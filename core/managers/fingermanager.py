@@ -1,6 +1,7 @@
 import traceback
 
 from collections import namedtuple
+from operator import attrgetter
 
 from adsk.core import ObjectCollection
 from adsk.core import Point3D
@@ -19,6 +20,24 @@ EDT = PatternDistanceType.ExtentPatternDistanceType
 HorizontalDimension = do.HorizontalDimensionOrientation
 VerticalDimension = do.VerticalDimensionOrientation
 
+# Constraints applied to each corner rectangle, as
+# (constraint, corner attribute, border attribute) entries.
+# Both orientations currently share the same plan.
+CORNER_LINE_PLAN = (
+    ('addHorizontal', attrgetter('bottom.line'), None),
+    ('addHorizontal', attrgetter('top.line'), None),
+    ('addVertical', attrgetter('left.line'), None),
+    ('addVertical', attrgetter('right.line'), None),
+)
+LEFT_CORNER_PLAN = (
+    ('addCoincident', attrgetter('bottom.left.point'), attrgetter('bottom.left.point')),
+    ('addCoincident', attrgetter('top.right.point'), attrgetter('top.line')),
+) + CORNER_LINE_PLAN
+RIGHT_CORNER_PLAN = (
+    ('addCoincident', attrgetter('bottom.left.point'), attrgetter('bottom.line')),
+    ('addCoincident', attrgetter('top.right.point'), attrgetter('top.right.point')),
+) + CORNER_LINE_PLAN
+
 
 class PrimaryAxisMissing(Exception): pass
 
@@ -30,55 +49,119 @@ class FingerManager:
         self.face = properties.face
         self.alias = properties.alias
         self.border = border
+        self._is_vertical = border.is_vertical
+        self._width = border.width
+        self._left_origin = self.coordinates(border.bottom.left.geometry)
+        self._right_origin = self.coordinates(border.bottom.right.geometry)
         self.app = properties.app
         self.ui = properties.ui
         self.name = properties.name
         self.properties = properties
+        self._collection = ObjectCollection.create()
+
+        # Sketch collections; set by bind_sketch when draw starts
+        self.dimensions = None
+        self.constraints = None
+        self.lines = None
+
+        # The feature inputs only depend on the properties, so build
+        # them once instead of on every extrude and pattern.
+        self._depth = vi.createByReal(-properties.adjusted_depth.value)
+        edge_margin = properties.edge_margin.value
+        self._edge_offset = vi.createByReal(-abs(edge_margin)) if edge_margin else None
+        self._finger_quantity = vi.createByReal(properties.notches.value)
+        self._finger_distance = vi.createByReal(properties.pattern_distance.value)
+        self._finger_squantity = vi.createByReal(inputs.interior.value + 2)
+        self._corner_quantity = vi.createByReal(1)
+        self._corner_distance = vi.createByReal(0)
+        self._corner_squantity = vi.createByReal(2)
+        distance_two = properties.distance_two.value
+        self._second_distance = vi.createByReal(abs(distance_two)) if distance_two else None
+
+    def as_collection(self, items):
+        # Fusion copies the collection when the feature is added, so a
+        # single instance can be refilled for each extrude and pattern.
+        self._collection.clear()
+        for item in items:
+            self._collection.add(item)
+        return self._collection
+
+    def bind_sketch(self, sketch):
+        # The sketch collections are stable for the lifetime of the
+        # sketch. The constrain_*, draw_*_corner, get_secondary_axis and
+        # create_left_offset_dimension helpers rely on these, so this
+        # must run before any of them.
+        self.dimensions = sketch.sketchDimensions
+        self.constraints = sketch.geometricConstraints
+        self.lines = sketch.sketchCurves.sketchLines
 
     def configure_secondary_axis(self, input_, secondary, squantity):
-        if self.properties.distance_two.value and secondary and secondary.isValid:
-            value = abs(self.properties.distance_two.value)
-            second_distance = vi.createByReal(value)
+        if self._second_distance is not None and secondary and secondary.isValid:
             input_.setDirectionTwo(secondary,
-                                   vi.createByReal(squantity),
-                                   second_distance)
+                                   squantity,
+                                   self._second_distance)
+
+    def constrain_corner(self, corner, plan):
+        constraints = self.constraints
+        border = self.border
+        corner_bottom = corner.bottom
+        reference = corner_bottom.left.geometry
+
+        dimension = self.dimensions.addDistanceDimension(
+            corner_bottom.left.point,
+            corner_bottom.right.point,
+            HorizontalDimension,
+            Point3D.create(reference.x + .5, reference.y - .5, 0)
+        )
 
-    def constrain_corners(self, sketch, left_corner, right_corner):
-        if self.border.is_vertical:
-            return self.constrain_vertical_corners(sketch, left_corner, right_corner)
-        else:
-            return self.constrain_horizontal_corners(sketch, left_corner, right_corner)
+        for kind, first, second in plan:
+            if second is None:
+                getattr(constraints, kind)(first(corner))
+            else:
+                getattr(constraints, kind)(first(corner), second(border))
+
+        return dimension
 
-    def constrain_finger(self, sketch, finger):
-        dimensions = sketch.sketchDimensions
-        constraints = sketch.geometricConstraints
+    def constrain_corners(self, left_corner, right_corner):
+        left_dimension = self.constrain_corner(left_corner, LEFT_CORNER_PLAN)
+        right_dimension = self.constrain_corner(right_corner, RIGHT_CORNER_PLAN)
+        return left_dimension, right_dimension
+
+    def constrain_finger(self, finger):
+        constraints = self.constraints
+        dimensions = self.dimensions
+        border_bottom_left = self.border.bottom.left.point
+        bottom_left = finger.bottom.left.point
+        top_left = finger.top.left.point
+        top_right = finger.top.right.point
         reference = finger.bottom.left.geometry
 
-        if self.border.is_vertical:
+        if self._is_vertical:
             constraints.addVertical(finger.bottom.line)
             constraints.addVertical(finger.top.line)
             constraints.addHorizontal(finger.left.line)
             constraints.addHorizontal(finger.right.line)
 
+            text_point = Point3D.create(reference.x - .5, reference.y + .5, 0)
             finger_dimension = dimensions.addDistanceDimension(
-                finger.top.right.point,
-                finger.top.left.point,
+                top_right,
+                top_left,
                 VerticalDimension,
-                Point3D.create(reference.x - .5, reference.y + .5, 0)
+                text_point
             )
             offset_dimension = dimensions.addDistanceDimension(
-                finger.top.left.point,
-                self.border.bottom.left.point,
+                top_left,
+                border_bottom_left,
                 VerticalDimension,
-                Point3D.create(reference.x - .5, reference.y + .5, 0)
+                text_point
             )
 
             constraints.addCoincident(
-                finger.top.right.point,
+                top_right,
                 self.border.left.line
             )
             constraints.addCoincident(
-                finger.bottom.left.point,
+                bottom_left,
                 self.border.right.line
             )
         else:
@@ -87,166 +170,75 @@ class FingerManager:
             constraints.addVertical(finger.left.line)
             constraints.addVertical(finger.right.line)
 
+            text_point = Point3D.create(reference.x + .5, reference.y - .5, 0)
             finger_dimension = dimensions.addDistanceDimension(
-                finger.bottom.left.point,
+                bottom_left,
                 finger.bottom.right.point,
                 HorizontalDimension,
-                Point3D.create(reference.x + .5, reference.y - .5, 0)
+                text_point
             )
             offset_dimension = dimensions.addDistanceDimension(
-                finger.bottom.left.point,
-                self.border.bottom.left.point,
+                bottom_left,
+                border_bottom_left,
                 HorizontalDimension,
-                Point3D.create(reference.x + .5, reference.y - .5, 0)
+                text_point
             )
 
             constraints.addCoincident(
-                finger.bottom.left.point,
+                bottom_left,
                 self.border.bottom.line
             )
             constraints.addCoincident(
-                finger.top.right.point,
+                top_right,
                 self.border.top.line
             )
 
         return finger_dimension, offset_dimension
 
-    def constrain_horizontal_corners(self, sketch, left_corner, right_corner):
-        dimensions = sketch.sketchDimensions
-        constraints = sketch.geometricConstraints
-        lreference = left_corner.bottom.left.geometry
-        rreference = right_corner.bottom.left.geometry
-
-        left_dimension = dimensions.addDistanceDimension(
-            left_corner.bottom.left.point,
-            left_corner.bottom.right.point,
-            HorizontalDimension,
-            Point3D.create(lreference.x + .5, lreference.y - .5, 0)
-        )
-
-        constraints.addCoincident(
-            left_corner.bottom.left.point,
-            self.border.bottom.left.point
-        )
-        constraints.addCoincident(
-            left_corner.top.right.point,
-            self.border.top.line
-        )
-        constraints.addHorizontal(left_corner.bottom.line)
-        constraints.addHorizontal(left_corner.top.line)
-        constraints.addVertical(left_corner.left.line)
-        constraints.addVertical(left_corner.right.line)
-
-        right_dimension = dimensions.addDistanceDimension(
-            right_corner.bottom.left.point,
-            right_corner.bottom.right.point,
-            HorizontalDimension,
-            Point3D.create(rreference.x + .5, rreference.y - .5, 0)
-        )
-        constraints.addCoincident(
-            right_corner.bottom.left.point,
-            self.border.bottom.line
-        )
-        constraints.addCoincident(
-            right_corner.top.right.point,
-            self.border.top.right.point
-        )
-        constraints.addHorizontal(right_corner.bottom.line)
-        constraints.addHorizontal(right_corner.top.line)
-        constraints.addVertical(right_corner.left.line)
-        constraints.addVertical(right_corner.right.line)
-
-        return left_dimension, right_dimension
-
-    def constrain_vertical_corners(self, sketch, left_corner, right_corner):
-        dimensions = sketch.sketchDimensions
-        constraints = sketch.geometricConstraints
-        lreference = left_corner.bottom.left.geometry
-        rreference = right_corner.bottom.left.geometry
-
-        left_dimension = dimensions.addDistanceDimension(
-            left_corner.bottom.left.point,
-            left_corner.bottom.right.point,
-            HorizontalDimension,
-            Point3D.create(lreference.x + .5, lreference.y - .5, 0)
-        )
-
-        constraints.addCoincident(
-            left_corner.bottom.left.point,
-            self.border.bottom.left.point
-        )
-        constraints.addCoincident(
-            left_corner.top.right.point,
-            self.border.top.line
-        )
-        constraints.addHorizontal(left_corner.bottom.line)
-        constraints.addHorizontal(left_corner.top.line)
-        constraints.addVertical(left_corner.left.line)
-        constraints.addVertical(left_corner.right.line)
-
-        right_dimension = dimensions.addDistanceDimension(
-            right_corner.bottom.left.point,
-            right_corner.bottom.right.point,
-            HorizontalDimension,
-            Point3D.create(rreference.x + .5, rreference.y - .5, 0)
-        )
-        constraints.addCoincident(
-            right_corner.bottom.left.point,
-            self.border.bottom.line
-        )
-        constraints.addCoincident(
-            right_corner.top.right.point,
-            self.border.top.right.point
-        )
-        constraints.addHorizontal(right_corner.bottom.line)
-        constraints.addHorizontal(right_corner.top.line)
-        constraints.addVertical(right_corner.left.line)
-        constraints.addVertical(right_corner.right.line)
-
-        return left_dimension, right_dimension
-
-    def create_left_offset_dimension(self, sketch, parameter):
-        dimension = sketch.sketchDimensions
-        constraints = sketch.geometricConstraints
-        lines = sketch.sketchCurves.sketchLines
+    @staticmethod
+    def coordinates(point):
+        return point.x, point.y, point.z
 
-        start = fusion.next_point(self.border.bottom.left.geometry, parameter.value,
-                                  0, self.border.is_vertical)
-        end = fusion.next_point(start, 0,
-                                self.border.width, self.border.is_vertical)
+    def create_left_offset_dimension(self, parameter):
+        constraints = self.constraints
+        border = self.border
+        start, end = self.rectangle_points(self._left_origin, parameter.value, 0)
 
-        line = lines.addByTwoPoints(start, end)
+        line = self.lines.addByTwoPoints(start, end)
         line.isConstruction = True
+        text_point = Point3D.create(start.x + .5, start.y - .5, 0)
 
-        if self.border.is_vertical:
+        if self._is_vertical:
+            border_bottom_line = border.bottom.line
             constraints.addCoincident(
                 line.startSketchPoint,
-                self.border.right.line
+                border.right.line
             )
             constraints.addCoincident(
                 line.endSketchPoint,
-                self.border.left.line
+                border.left.line
             )
             constraints.addParallel(
-                line, self.border.bottom.line
+                line, border_bottom_line
             )
-            dimension = dimension.addOffsetDimension(self.border.bottom.line, line,
-                                                     Point3D.create(start.x + .5, start.y - .5, 0))
+            dimension = self.dimensions.addOffsetDimension(border_bottom_line, line,
+                                                           text_point)
         else:
+            border_left_line = border.left.line
             constraints.addCoincident(
                 line.startSketchPoint,
-                self.border.bottom.line
+                border.bottom.line
             )
             constraints.addCoincident(
                 line.endSketchPoint,
-                self.border.top.line
+                border.top.line
             )
             constraints.addParallel(
-                line, self.border.left.line
+                line, border_left_line
             )
 
-            dimension = dimension.addOffsetDimension(self.border.left.line, line,
-                                                     Point3D.create(start.x + .5, start.y - .5, 0))
+            dimension = self.dimensions.addOffsetDimension(border_left_line, line,
+                                                           text_point)
         dimension.parameter.name = parameter.name
         if self.properties.parametric and not self.properties.preview_enabled:
             dimension.parameter.expression = parameter.expression
@@ -261,25 +253,30 @@ class FingerManager:
         sketch.isComputeDeferred = True
         sketch.name = '{} Finger Sketch'.format(self.name)
 
+        self.bind_sketch(sketch)
+
         timeline = self.app.activeProduct.timeline
 
         extrudes = self.inputs.selected_body.parentComponent.features.extrudeFeatures
         body = self.inputs.selected_body
         primary = self.border.reference_line
-        secondary = self.get_secondary_axis(sketch)
+        secondary = self.get_secondary_axis()
 
         start_mp = timeline.markerPosition-1
 
         for item in self.properties.ordered:
             try:
-                self.create_left_offset_dimension(sketch, item)
+                self.create_left_offset_dimension(item)
             except:
                 self.ui.messageBox('Error configuring parameter: {} -- {}'.format(item.name, item.expression))
                 self.ui.messageBox(traceback.format_exc(3))
 
         # The finger has to be drawn and extruded first; the operation
         # will fail after the corners are cut, since the edge reference
-        # becomes invalid.
+        # becomes invalid. For the same reason the finger and corner cuts
+        # can't share a single extrude, and they can't share a pattern
+        # either, since the corners are only duplicated along the
+        # secondary axis.
         finger, finger_cut, finger_pattern, finger_dimension, start_dimension = self.draw_finger(sketch, extrudes,
                                                                                                  body, primary,
                                                                                                  secondary)
@@ -308,46 +305,39 @@ class FingerManager:
                           finger_dimension, sketch)
 
     def draw_corner(self, sketch, extrudes, body, primary, secondary):
-        left_corner = self.draw_left_corner(sketch)
-        right_corner = self.draw_right_corner(sketch)
+        left_corner = self.draw_left_corner()
+        right_corner = self.draw_right_corner()
         corner_cut = self.extrude_corner(body, extrudes, sketch)
         corner_pattern = self.duplicate_corner(body, primary, secondary, corner_cut)
 
-        left_dimension, right_dimension = self.constrain_corners(sketch, left_corner, right_corner)
+        left_dimension, right_dimension = self.constrain_corners(left_corner, right_corner)
         return corner_cut, corner_pattern, left_dimension, right_dimension
 
-    def draw_left_corner(self, sketch):
-        lines = sketch.sketchCurves.sketchLines
-        start = self.border.bottom.left.geometry
-        end = fusion.next_point(start, self.properties.offset.value,
-                                self.border.width, self.border.is_vertical)
+    def draw_left_corner(self):
+        start, end = self.rectangle_points(self._left_origin, 0,
+                                           self.properties.offset.value)
 
-        return fusion.Rectangle(lines.addTwoPointRectangle(start, end))
+        return fusion.Rectangle(self.lines.addTwoPointRectangle(start, end))
 
     def draw_finger(self, sketch, extrudes, body, primary, secondary):
-        lines = sketch.sketchCurves.sketchLines
-        start = fusion.next_point(self.border.bottom.left.geometry, self.properties.start.value,
-                                  0, self.border.is_vertical)
-        end = fusion.next_point(start, self.properties.finger_length.value,
-                                self.border.width, self.border.is_vertical)
-
-        finger = fusion.Rectangle(lines.addTwoPointRectangle(start, end))
-        finger_dimension, offset_dimension = self.constrain_finger(sketch, finger)
+        start, end = self.rectangle_points(self._left_origin,
+                                           self.properties.start.value,
+                                           self.properties.finger_length.value)
+
+        finger = fusion.Rectangle(self.lines.addTwoPointRectangle(start, end))
+        finger_dimension, offset_dimension = self.constrain_finger(finger)
         sketch.isComputeDeferred = False
-        finger_cut = self.extrude_finger(body, extrudes, sketch, self.properties.edge_margin.value)
+        finger_cut = self.extrude_finger(body, extrudes, sketch)
         finger_pattern = self.duplicate_finger(body, primary, secondary, finger_cut)
         sketch.isComputeDeferred = True
 
         return finger, finger_cut, finger_pattern, finger_dimension, offset_dimension
 
-    def draw_right_corner(self, sketch):
-        lines = sketch.sketchCurves.sketchLines
-        start = fusion.next_point(self.border.bottom.right.geometry,
-                                  -self.properties.offset.value, 0, self.border.is_vertical)
-        end = fusion.next_point(start, self.properties.offset.value,
-                                self.border.width, self.border.is_vertical)
+    def draw_right_corner(self):
+        offset = self.properties.offset.value
+        start, end = self.rectangle_points(self._right_origin, -offset, offset)
 
-        return fusion.Rectangle(lines.addTwoPointRectangle(start, end))
+        return fusion.Rectangle(self.lines.addTwoPointRectangle(start, end))
 
     def duplicate(self, name, features, quantity, distance,
                   squantity, primary, secondary, body):
@@ -355,15 +345,10 @@ class FingerManager:
         if not primary or not primary.isValid:
             raise PrimaryAxisMissing
 
-        entities = ObjectCollection.create()
-        for feature in features:
-            entities.add(feature)
+        entities = self.as_collection(features)
 
         patterns = body.parentComponent.features.rectangularPatternFeatures
 
-        quantity = vi.createByReal(quantity)
-        distance = vi.createByReal(distance)
-
         input_ = patterns.createInput(entities, primary, quantity, distance, EDT)
         # input_.patternComputeOption = pco.IdenticalPatternCompute
         input_.patternComputeOption = pco.AdjustPatternCompute
@@ -380,30 +365,25 @@ class FingerManager:
 
     def duplicate_corner(self, body, primary, secondary, corner_cut):
         dname = '{} Corner Duplicate Pattern'.format(self.name)
-        return self.duplicate(dname, [corner_cut], 1, 0,
-                              2, primary, secondary, body)
+        return self.duplicate(dname, [corner_cut], self._corner_quantity,
+                              self._corner_distance, self._corner_squantity,
+                              primary, secondary, body)
 
     def duplicate_finger(self, body, primary, secondary, finger_cut):
-        quantity = self.properties.notches.value
-        distance = self.properties.pattern_distance.value
         dname = '{} Finger Duplicate Pattern'.format(self.name)
-        return self.duplicate(dname, [finger_cut], quantity, distance,
-                              self.inputs.interior.value + 2,
+        return self.duplicate(dname, [finger_cut], self._finger_quantity,
+                              self._finger_distance, self._finger_squantity,
                               primary, secondary, body)
 
-    def extrude(self, profiles, body, extrudes, name, edge_offset):
-        selection = ObjectCollection.create()
-
-        for profile in profiles:
-            selection.add(profile)
+    def extrude(self, profiles, body, extrudes, name):
+        selection = self.as_collection(profiles)
 
-        dist = vi.createByReal(-self.properties.adjusted_depth.value)
         cut_input = extrudes.createInput(selection, CFO)
-        cut_input.setDistanceExtent(False, dist)
+        cut_input.setDistanceExtent(False, self._depth)
         cut_input.participantBodies = [body]
 
-        if edge_offset:
-            offset = OffsetStartDefinition.create(vi.createByReal(-abs(edge_offset)))
+        if self._edge_offset is not None:
+            offset = OffsetStartDefinition.create(self._edge_offset)
             cut_input.startExtent = offset
 
         cut = extrudes.add(cut_input)
@@ -412,18 +392,17 @@ class FingerManager:
         return cut
 
     def extrude_corner(self, body, extrudes, sketch):
-        edge_offset = self.properties.edge_margin.value
         name = '{} Corner Cut Extrude'.format(self.name)
         profiles = [sketch.profiles.item(1), sketch.profiles.item(2)]
-        return self.extrude(profiles, body, extrudes, name, edge_offset)
+        return self.extrude(profiles, body, extrudes, name)
 
-    def extrude_finger(self, body, extrudes, sketch, edge_offset):
+    def extrude_finger(self, body, extrudes, sketch):
         profiles = [sketch.profiles.item(0)]
         cname = '{} Finger Cut Extrude'.format(self.name)
-        return self.extrude(profiles, body, extrudes, cname, edge_offset)
+        return self.extrude(profiles, body, extrudes, cname)
 
-    def get_secondary_axis(self, sketch):
-        if self.border.is_vertical:
+    def get_secondary_axis(self):
+        if self._is_vertical:
             start = self.border.bottom.left
         else:
             start = self.border.top.left
@@ -433,10 +412,23 @@ class FingerManager:
         if not secondary:
             start = start.geometry
             end = Point3D.create(start.x, start.y, start.z - 10)
-            secondary = sketch.sketchCurves.sketchLines.addByTwoPoints(start, end)
+            secondary = self.lines.addByTwoPoints(start, end)
             secondary.isConstruction = True
         return secondary
 
+    def rectangle_points(self, origin, offset, length):
+        # Work on plain floats so that the only Fusion API calls are
+        # the two Point3D allocations handed to the sketch.
+        x, y, z = origin
+        if self._is_vertical:
+            y += offset
+            end = (x + self._width, y + length)
+        else:
+            x += offset
+            end = (x + length, y + self._width)
+
+        return Point3D.create(x, y, z), Point3D.create(end[0], end[1], z)
+
     def save(self, properties):
         if not self.inputs.parametric:
             self.properties.save(properties)